@@ -1,12 +1,43 @@
 #!/usr/bin/env python3
 import json
 import sys
+from pathlib import Path
+
+# Prefer orjson for reading/writing the multi-MB specs, fall back to json
+try:
+    import orjson
+
+    def loads(data):
+        return orjson.loads(data)
+
+    def dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def loads(data):
+        return json.loads(data)
+
+    def dumps(obj):
+        return json.dumps(obj, indent=2).encode()
+
+def find_refs(root, found):
+    """Add the schema names of all $ref references under root to found"""
+    # Iterative walk: the spec only holds builtin JSON types, so exact type
+    # checks are enough and deep schemas cannot hit the recursion limit
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if type(obj) is dict:
+            ref = obj.get("$ref")
+            if type(ref) is str and "#/components/schemas/" in ref:
+                found.add(ref.rsplit("/", 1)[-1])
+            stack.extend(obj.values())
+        elif type(obj) is list:
+            stack.extend(obj)
 
 def extract_version_spec(input_file, output_file, version="v0.0.41"):
     """Extract specific version endpoints and schemas from combined OpenAPI spec"""
     
-    with open(input_file, 'r') as f:
-        spec = json.load(f)
+    spec = loads(Path(input_file).read_bytes())
     
     # Create new spec with basic info
     new_spec = {
@@ -25,61 +56,50 @@ def extract_version_spec(input_file, output_file, version="v0.0.41"):
     }
     
     # Extract paths for this version
+    version_segment = f"/{version}/"
+    legacy_segment = "/v0041/"
+    new_paths = new_spec["paths"]
     for path, methods in spec.get("paths", {}).items():
-        if f"/{version}/" in path or f"/v0041/" in path:
-            new_spec["paths"][path] = methods
+        if version_segment in path or legacy_segment in path:
+            new_paths[path] = methods
     
     # Extract schemas referenced by these paths
     schemas_to_extract = set()
     
-    def find_refs(obj):
-        """Recursively find all $ref references"""
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                if key == "$ref" and isinstance(value, str):
-                    if "#/components/schemas/" in value:
-                        schema_name = value.split("/")[-1]
-                        schemas_to_extract.add(schema_name)
-                else:
-                    find_refs(value)
-        elif isinstance(obj, list):
-            for item in obj:
-                find_refs(item)
-    
     # Find all schema references in the paths
-    find_refs(new_spec["paths"])
+    find_refs(new_spec["paths"], schemas_to_extract)
     
     # Extract schemas for v0.0.41
     all_schemas = spec.get("components", {}).get("schemas", {})
     
-    # First pass: get v0.0.41 specific schemas
-    for schema_name in list(schemas_to_extract):
-        if schema_name in all_schemas:
-            new_spec["components"]["schemas"][schema_name] = all_schemas[schema_name]
-            # Find nested references
-            find_refs(all_schemas[schema_name])
-    
     # Also include schemas that start with v0_0_41 or v0.0.41
-    for schema_name, schema_def in all_schemas.items():
-        if schema_name.startswith("v0_0_41") or schema_name.startswith("v0.0.41"):
-            new_spec["components"]["schemas"][schema_name] = schema_def
+    for schema_name in all_schemas:
+        if schema_name.startswith(("v0_0_41", "v0.0.41")):
             schemas_to_extract.add(schema_name)
-            find_refs(schema_def)
     
-    # Second pass: get all referenced schemas
-    max_iterations = 10  # Prevent infinite loops
-    for _ in range(max_iterations):
-        initial_count = len(schemas_to_extract)
-        for schema_name in list(schemas_to_extract):
-            if schema_name in all_schemas and schema_name not in new_spec["components"]["schemas"]:
-                new_spec["components"]["schemas"][schema_name] = all_schemas[schema_name]
-                find_refs(all_schemas[schema_name])
-        if len(schemas_to_extract) == initial_count:
-            break
+    # Depth-first walk from those roots; each schema is scanned for nested
+    # references once, and cycles stop at the visited set
+    visited = set()
+    stack = list(schemas_to_extract)
+    while stack:
+        schema_name = stack.pop()
+        if schema_name in visited:
+            continue
+        visited.add(schema_name)
+        schema_def = all_schemas.get(schema_name)
+        if schema_def is None:
+            continue
+        new_refs = set()
+        find_refs(schema_def, new_refs)
+        stack.extend(new_refs.difference(visited))
+    
+    # Build the output in one go, keeping the source spec's schema order
+    new_spec["components"]["schemas"] = {
+        name: schema_def for name, schema_def in all_schemas.items() if name in visited
+    }
     
     # Write the extracted spec
-    with open(output_file, 'w') as f:
-        json.dump(new_spec, f, indent=2)
+    Path(output_file).write_bytes(dumps(new_spec))
     
     print(f"Extracted {len(new_spec['paths'])} paths and {len(new_spec['components']['schemas'])} schemas for {version}")
 
@@ -17,10 +17,13 @@ import argparse
 import json
 import re
 import sys
+from collections import deque
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Set, Optional, Tuple
 from dataclasses import dataclass, field
 
 # Try to import yaml, fall back to built-in config if not available
@@ -30,6 +33,20 @@ try:
 except ImportError:
     YAML_AVAILABLE = False
 
+# Try to import ijson, fall back to a full parse if not available
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Try to import orjson for the full parse, fall back to json if not available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 # =============================================================================
 # Constants
@@ -37,9 +54,26 @@ except ImportError:
 
 VERSION_PREFIX_TEMPLATE = "v{version}_"
 ENUM_TYPE_SUFFIX = "Value"
+# Characters not allowed in Go constant names built from enum values
+ENUM_VALUE_INVALID_CHARS = re.compile(r'[^a-zA-Z0-9_]')
+# Same mapping as a str.translate table, for the (usual) all-ASCII values
+ENUM_VALUE_TRANSLATION = {
+    i: '_' for i in range(128)
+    if not (chr(i).isalnum() or chr(i) == '_')
+}
 DEFAULT_LINE_LENGTH = 80
 DEFAULT_DESCRIPTION_CUTOFF = 40
 
+# Shared read-only stand-in for a missing schema (avoids a new {} per miss)
+EMPTY_SCHEMA = MappingProxyType({})
+
+# Top-level spec sections the generator reads (everything else, notably
+# 'paths', is skipped when streaming the spec)
+SPEC_SECTIONS = ('openapi', 'info', 'components')
+# Specs smaller than this are parsed whole: orjson/json beat ijson's
+# event stream by 3-5x on the bundled (~0.4-1.2 MB) specs
+STREAMING_SPEC_MIN_BYTES = 32 * 1024 * 1024
+
 # Go naming convention acronyms (lowercase -> uppercase)
 GO_ACRONYMS = {
     'id': 'ID',
@@ -85,6 +119,26 @@ GO_ACRONYMS = {
     'gres': 'GRES',
 }
 
+# Longest acronym key; longer name parts can skip the lowercase + lookup
+GO_ACRONYM_MAX_LEN = max(map(len, GO_ACRONYMS))
+
+# OpenAPI primitive type -> Go type
+PRIMITIVE_TYPE_MAP = {
+    'string': 'string',
+    'integer': 'int32',
+    'number': 'float64',
+    'boolean': 'bool',
+}
+
+# OpenAPI format -> Go type, overriding PRIMITIVE_TYPE_MAP
+# ('uint64' depends on the field name and is handled in resolve_type)
+FORMAT_TYPE_MAP = {
+    'int64': 'int64',
+    'uint32': 'uint32',
+    'uint16': 'uint16',
+    'date-time': 'time.Time',
+}
+
 # Default configuration values (single source of truth)
 DEFAULT_TIMESTAMP_FIELDS = {
     'boot_time', 'last_busy', 'eligible_time', 'end_time', 'start_time',
@@ -189,8 +243,8 @@ class OutputFormat(Enum):
 @dataclass
 class Config:
     """Configuration for type generation, loaded from YAML or defaults."""
-    timestamp_fields: Set[str] = field(default_factory=set)
-    duration_fields: Set[str] = field(default_factory=set)
+    timestamp_fields: FrozenSet[str] = field(default_factory=frozenset)
+    duration_fields: FrozenSet[str] = field(default_factory=frozenset)
     friendly_overrides: Dict[str, str] = field(default_factory=dict)
     primitive_unwrap_patterns: List[Tuple[str, str]] = field(default_factory=list)
     base_entities: Dict[str, str] = field(default_factory=dict)
@@ -199,6 +253,8 @@ class Config:
     enum_type_overrides: Dict[Tuple[str, str], str] = field(default_factory=dict)
     write_entities: Dict[str, str] = field(default_factory=dict)
     write_auxiliary_types: Dict[str, str] = field(default_factory=dict)
+    # Emit single-value enums as plain strings instead of enum types
+    collapse_singleton_enums: bool = False
 
     @classmethod
     def load(cls, config_path: Optional[Path], version: str) -> 'Config':
@@ -218,9 +274,14 @@ class Config:
 
         # Merge defaults with version-specific config
         config = cls()
-        config.timestamp_fields = set(defaults.get('timestamp_fields', DEFAULT_TIMESTAMP_FIELDS))
-        config.duration_fields = set(defaults.get('duration_fields', DEFAULT_DURATION_FIELDS))
-        config.friendly_overrides = {**DEFAULT_FRIENDLY_OVERRIDES, **defaults.get('friendly_overrides', {})}
+        # Field names are interned so lookups with (interned) spec property
+        # names can match on identity
+        config.timestamp_fields = frozenset(
+            map(sys.intern, defaults.get('timestamp_fields', DEFAULT_TIMESTAMP_FIELDS)))
+        config.duration_fields = frozenset(
+            map(sys.intern, defaults.get('duration_fields', DEFAULT_DURATION_FIELDS)))
+        config.friendly_overrides = dict(DEFAULT_FRIENDLY_OVERRIDES)
+        config.friendly_overrides.update(defaults.get('friendly_overrides', {}))
 
         # Convert primitive_unwrap_patterns from dict to list of tuples
         patterns_dict = defaults.get('primitive_unwrap_patterns', {})
@@ -229,11 +290,13 @@ class Config:
         else:
             config.primitive_unwrap_patterns = DEFAULT_PRIMITIVE_UNWRAP_PATTERNS.copy()
 
-        config.base_entities = {**DEFAULT_BASE_ENTITIES, **defaults.get('base_entities', {})}
+        config.base_entities = dict(DEFAULT_BASE_ENTITIES)
+        config.base_entities.update(defaults.get('base_entities', {}))
 
         # Type unwrap from version-specific config
         config.type_unwrap = version_config.get('type_unwrap', {})
-        config.auxiliary_types = {**DEFAULT_AUXILIARY_TYPES, **version_config.get('auxiliary_types', {})}
+        config.auxiliary_types = dict(DEFAULT_AUXILIARY_TYPES)
+        config.auxiliary_types.update(version_config.get('auxiliary_types', {}))
 
         # Enum type overrides
         enum_overrides = defaults.get('enum_type_overrides', {})
@@ -242,17 +305,17 @@ class Config:
             # Key format: "type.field" -> ("type", "field")
             parts = key.split('.')
             if len(parts) == 2:
-                config.enum_type_overrides[(parts[0], parts[1])] = value
+                config.enum_type_overrides[(sys.intern(parts[0]), sys.intern(parts[1]))] = value
 
         # Write entities: merge defaults with version-specific
-        default_write_entities = defaults.get('write_entities', {})
-        version_write_entities = version_config.get('write_entities', {})
-        config.write_entities = {**default_write_entities, **version_write_entities}
+        config.write_entities = dict(defaults.get('write_entities', {}))
+        config.write_entities.update(version_config.get('write_entities', {}))
 
         # Write auxiliary types: merge defaults with version-specific
-        default_write_aux = defaults.get('write_auxiliary_types', {})
-        version_write_aux = version_config.get('write_auxiliary_types', {})
-        config.write_auxiliary_types = {**default_write_aux, **version_write_aux}
+        config.write_auxiliary_types = dict(defaults.get('write_auxiliary_types', {}))
+        config.write_auxiliary_types.update(version_config.get('write_auxiliary_types', {}))
+
+        config.collapse_singleton_enums = bool(defaults.get('collapse_singleton_enums', False))
 
         return config
 
@@ -261,8 +324,8 @@ class Config:
         """Load default configuration (fallback when YAML not available)."""
         config = cls()
 
-        config.timestamp_fields = set(DEFAULT_TIMESTAMP_FIELDS)
-        config.duration_fields = set(DEFAULT_DURATION_FIELDS)
+        config.timestamp_fields = frozenset(DEFAULT_TIMESTAMP_FIELDS)
+        config.duration_fields = frozenset(DEFAULT_DURATION_FIELDS)
         config.friendly_overrides = dict(DEFAULT_FRIENDLY_OVERRIDES)
         config.primitive_unwrap_patterns = list(DEFAULT_PRIMITIVE_UNWRAP_PATTERNS)
         config.base_entities = dict(DEFAULT_BASE_ENTITIES)
@@ -307,9 +370,11 @@ class GoField:
     json_tag: str
     description: str
     required: bool
+    # Format-independent pieces of the declaration, computed once
+    _type_prefix: str = field(init=False, repr=False, compare=False)
+    _omit: str = field(init=False, repr=False, compare=False)
 
-    def to_string(self, output_format: OutputFormat = OutputFormat.FULL) -> str:
-        """Convert to Go field declaration string."""
+    def __post_init__(self):
         # Don't add pointer for arrays, maps, required fields, or time.Time
         needs_pointer = (
             not self.required
@@ -317,25 +382,40 @@ class GoField:
             and not self.go_type.startswith("map[")
             and self.go_type != "time.Time"
         )
-        ptr = "*" if needs_pointer else ""
-        omit = "" if self.required else ",omitempty"
-
-        # Handle comments based on format
-        if output_format == OutputFormat.MINIMAL:
-            comment = ""
-        elif output_format == OutputFormat.COMPACT:
-            # Truncate at 40 chars
-            desc = self.description[:40] + "..." if len(self.description) > 40 else self.description
-            comment = f" // {desc}" if desc else ""
-        else:
-            comment = f" // {self.description}" if self.description else ""
+        self._type_prefix = " *" if needs_pointer else " "
+        self._omit = "" if self.required else ",omitempty"
+
+    def to_string(self, output_format: OutputFormat = OutputFormat.FULL) -> str:
+        """Convert to Go field declaration string."""
+        return GO_FIELD_EMITTERS[output_format](self)
+
+    def _declaration(self, comment: str) -> str:
+        return ''.join(('\t', self.name, self._type_prefix, self.go_type,
+                        ' `json:"', self.json_tag, self._omit, '"`', comment))
+
+    def _to_string_full(self) -> str:
+        return self._declaration(f" // {self.description}" if self.description else "")
+
+    def _to_string_minimal(self) -> str:
+        return self._declaration("")
 
-        return f'\t{self.name} {ptr}{self.go_type} `json:"{self.json_tag}{omit}"`{comment}'
+    def _to_string_compact(self) -> str:
+        # Truncate at 40 chars
+        desc = self.description[:40] + "..." if len(self.description) > 40 else self.description
+        return self._declaration(f" // {desc}" if desc else "")
 
     def __str__(self):
         return self.to_string(OutputFormat.FULL)
 
 
+# Output format -> GoField emitter, so callers can pick one once per run
+GO_FIELD_EMITTERS = {
+    OutputFormat.FULL: GoField._to_string_full,
+    OutputFormat.MINIMAL: GoField._to_string_minimal,
+    OutputFormat.COMPACT: GoField._to_string_compact,
+}
+
+
 @dataclass
 class GeneratedType:
     """Result of generating a Go type."""
@@ -356,16 +436,18 @@ def get_version_prefix(version: str) -> str:
     return VERSION_PREFIX_TEMPLATE.format(version=version)
 
 
+@lru_cache(maxsize=4096)
 def to_go_field_name(name: str) -> str:
     """Convert JSON field name to Go field name (snake_case -> PascalCase)."""
     parts = name.split('_')
     result = []
     for part in parts:
-        lower = part.lower()
-        if lower in GO_ACRONYMS:
-            result.append(GO_ACRONYMS[lower])
-        else:
-            result.append(part.capitalize())
+        if len(part) <= GO_ACRONYM_MAX_LEN:
+            acronym = GO_ACRONYMS.get(part.lower())
+            if acronym is not None:
+                result.append(acronym)
+                continue
+        result.append(part.capitalize())
     return ''.join(result)
 
 
@@ -381,6 +463,12 @@ def schema_to_friendly_name(schema_name: str, prefix: str,
     if clean in friendly_overrides:
         return friendly_overrides[clean]
 
+    return _schema_type_name(clean)
+
+
+@lru_cache(maxsize=4096)
+def _schema_type_name(clean: str) -> str:
+    """Convert an unprefixed schema name to PascalCase, dropping 'info' parts."""
     # Convert snake_case to PascalCase using GO_ACRONYMS
     parts = clean.split('_')
     result = []
@@ -397,29 +485,37 @@ def schema_to_friendly_name(schema_name: str, prefix: str,
 
 
 def find_all_refs(obj, found=None) -> Set[str]:
-    """Recursively find all $ref values in a schema."""
+    """Find all $ref values in a schema (iterative walk, no recursion limit)."""
     if found is None:
         found = set()
-    if isinstance(obj, dict):
-        if '$ref' in obj:
-            ref = obj['$ref'].split('/')[-1]
-            found.add(ref)
-        for v in obj.values():
-            find_all_refs(v, found)
-    elif isinstance(obj, list):
-        for item in obj:
-            find_all_refs(item, found)
+    # Parsed JSON only contains builtin types, so exact type checks suffice
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if type(node) is dict:
+            ref = node.get('$ref')
+            if ref is not None:
+                found.add(ref.rsplit('/', 1)[-1])
+            stack.extend(node.values())
+        elif type(node) is list:
+            stack.extend(node)
     return found
 
 
-def truncate_description(description: str, max_length: int = DEFAULT_LINE_LENGTH) -> str:
-    """Truncate description to max length, breaking at word boundary."""
+def truncate_description(description: str, max_length: int = DEFAULT_LINE_LENGTH,
+                         min_cutoff: int = DEFAULT_DESCRIPTION_CUTOFF) -> str:
+    """
+    Truncate description to max length, breaking at word boundary.
+
+    Breaks at the last space before max_length if that keeps more than
+    min_cutoff characters, otherwise cuts at max_length.
+    """
     if len(description) <= max_length:
         return description
 
     # Find last space before max_length
     cutoff = description.rfind(' ', 0, max_length)
-    if cutoff > DEFAULT_DESCRIPTION_CUTOFF:
+    if cutoff > min_cutoff:
         return description[:cutoff] + "..."
     return description[:max_length] + "..."
 
@@ -481,9 +577,41 @@ def validate_openapi_spec(spec: dict, spec_file: Path) -> List[str]:
 
 
 def load_openapi_spec(spec_file: Path) -> dict:
-    """Load OpenAPI specification from JSON file."""
-    with open(spec_file) as f:
-        return json.load(f)
+    """
+    Load OpenAPI specification from JSON file.
+
+    Files of at least STREAMING_SPEC_MIN_BYTES are streamed with ijson (if
+    installed) and only SPEC_SECTIONS are materialized, which keeps the large
+    'paths' tree out of memory. Otherwise the whole file is parsed, with
+    orjson if available.
+    """
+    if not IJSON_AVAILABLE or Path(spec_file).stat().st_size < STREAMING_SPEC_MIN_BYTES:
+        if ORJSON_AVAILABLE:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            return orjson.loads(Path(spec_file).read_bytes())
+        with open(spec_file) as f:
+            return json.load(f)
+
+    spec = {}
+    section = None
+    builder = None
+    try:
+        with open(spec_file, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is None:
+                    if prefix == '' and event == 'map_key' and value in SPEC_SECTIONS:
+                        section = value
+                        builder = ijson.ObjectBuilder()
+                    continue
+                builder.event(event, value)
+                # The section is complete when its own container closes
+                # (or immediately, for a scalar value)
+                if prefix == section and event not in ('start_map', 'start_array', 'map_key'):
+                    spec[section] = builder.value
+                    builder = None
+    except ijson.JSONError as e:
+        raise OpenAPIValidationError(f"{spec_file}: Invalid JSON: {e}") from e
+    return spec
 
 
 # =============================================================================
@@ -515,24 +643,11 @@ def get_entity_schemas(version: str, config: Optional[Config] = None) -> Dict[st
     Maps OpenAPI schema name -> friendly Go type name.
     """
     prefix = get_version_prefix(version)
-
-    if config:
-        result = {}
-        # Add base entities
-        for key, value in config.base_entities.items():
-            result[prefix + key] = value
-        # Add auxiliary types
-        for key, value in config.auxiliary_types.items():
-            result[prefix + key] = value
-        return result
-
-    # Fallback to defaults
-    default_config = Config._load_defaults(version)
-    result = {}
-    for key, value in default_config.base_entities.items():
-        result[prefix + key] = value
-    for key, value in default_config.auxiliary_types.items():
-        result[prefix + key] = value
+    # Fall back to defaults without a config
+    config = config or Config._load_defaults(version)
+    # Base entities followed by auxiliary types
+    result = {prefix + k: v for k, v in config.base_entities.items()}
+    result.update((prefix + k, v) for k, v in config.auxiliary_types.items())
     return result
 
 
@@ -558,13 +673,9 @@ def get_write_entity_schemas(version: str, config: Optional[Config] = None) -> D
     prefix = get_version_prefix(version)
 
     if config and config.write_entities:
-        result = {}
-        # Add write entities
-        for key, value in config.write_entities.items():
-            result[prefix + key] = value
-        # Add write auxiliary types
-        for key, value in config.write_auxiliary_types.items():
-            result[prefix + key] = value
+        # Write auxiliary types follow the write entities
+        result = {prefix + k: v for k, v in config.write_entities.items()}
+        result.update((prefix + k, v) for k, v in config.write_auxiliary_types.items())
         return result
 
     # Fallback to default write entities
@@ -582,8 +693,11 @@ def discover_schemas(spec: dict, version: str, base_schemas: Dict[str, str],
     prefix = get_version_prefix(version)
     schemas = spec.get('components', {}).get('schemas', {})
 
-    # Get primitive unwrap patterns from config or defaults
+    # Get primitive unwrap patterns from config or defaults, combined into a
+    # single alternation so each ref name is matched in one regex pass
     primitive_patterns = config.primitive_unwrap_patterns if config else DEFAULT_PRIMITIVE_UNWRAP_PATTERNS
+    primitive_re = (re.compile('|'.join(re.escape(pattern) for pattern, _ in primitive_patterns))
+                    if primitive_patterns else None)
 
     # Start with base schemas
     to_generate = dict(base_schemas)
@@ -591,45 +705,42 @@ def discover_schemas(spec: dict, version: str, base_schemas: Dict[str, str],
 
     # Track what we've processed
     processed = set()
-    queue = list(base_schemas.keys())
+    queue = deque(base_schemas.keys())
+    # Refs already classified; the outcome depends only on the ref itself,
+    # so a ref shared by many parents (TRES, step IDs, ...) is handled once
+    classified_refs: Set[str] = set()
 
     while queue:
-        schema_name = queue.pop(0)
+        schema_name = queue.popleft()
         if schema_name in processed:
             continue
         processed.add(schema_name)
 
-        schema = schemas.get(schema_name, {})
+        schema = schemas.get(schema_name) or EMPTY_SCHEMA
 
         # Find all $ref in this schema
         refs = find_all_refs(schema)
 
         for ref_name in refs:
-            if ref_name in processed:
+            if ref_name in processed or ref_name in classified_refs:
                 continue
+            classified_refs.add(ref_name)
 
-            ref_schema = schemas.get(ref_name, {})
+            ref_schema = schemas.get(ref_name) or EMPTY_SCHEMA
 
             # Check if it's a primitive unwrap pattern
             clean_name = ref_name.replace(prefix, '')
-            is_primitive = False
-            for pattern, _ in primitive_patterns:
-                if pattern in clean_name:
-                    is_primitive = True
-                    break
-
-            if is_primitive:
+            if primitive_re is not None and primitive_re.search(clean_name):
                 continue  # Already handled by get_type_unwrap_map
 
             # Skip deprecated types with no properties (convert to interface{})
-            if (ref_schema.get('deprecated', False) and
-                not ref_schema.get('properties', {})):
+            if ref_schema.get('deprecated') and not ref_schema.get('properties'):
                 array_unwrap[ref_name] = 'interface{}'
                 continue
 
             # Check if it's an array type
             if ref_schema.get('type') == 'array':
-                items = ref_schema.get('items', {})
+                items = ref_schema.get('items') or EMPTY_SCHEMA
                 if '$ref' in items:
                     item_ref = items['$ref'].split('/')[-1]
                     item_name = schema_to_friendly_name(item_ref, prefix, config)
@@ -644,11 +755,8 @@ def discover_schemas(spec: dict, version: str, base_schemas: Dict[str, str],
                     go_type = {'string': 'string', 'integer': 'int32', 'boolean': 'bool'}.get(item_type, 'interface{}')
                     array_unwrap[ref_name] = f'[]{go_type}'
                 else:
-                    # Empty items: {} - infer from schema name
-                    clean = ref_name.replace(prefix, '')
-                    # Try to make a reasonable type name
-                    item_name = schema_to_friendly_name(ref_name, prefix, config) + 'Item'
-                    array_unwrap[ref_name] = f'[]interface{{}}'  # Safe fallback
+                    # Empty items: {} - no item type to infer
+                    array_unwrap[ref_name] = '[]interface{}'  # Safe fallback
             else:
                 # It's a struct type - add to generation queue
                 if ref_name not in to_generate:
@@ -667,33 +775,65 @@ class TypeGenerator:
     """Generates Go types from OpenAPI schemas."""
 
     # Class-level tracking of globally generated enum types (shared across instances)
-    _global_enum_types: Dict[str, List[str]] = {}
+    # (type_name -> sorted enum values; emission order lives in self.enum_types)
+    _global_enum_types: Dict[str, Tuple[str, ...]] = {}
+    # Sorted enum values -> first registered type name with those values
+    _global_enum_values_index: Dict[Tuple[str, ...], str] = {}
 
     def __init__(self, spec: dict, version: str, friendly_names: Dict[str, str],
                  config: Optional[Config] = None,
                  output_format: OutputFormat = OutputFormat.FULL,
-                 known_enum_types: Optional[Set[str]] = None):
+                 known_enum_types: Optional[FrozenSet[str]] = None):
         self.spec = spec
         self.version = version
         self.version_prefix = get_version_prefix(version)
         self.config = config or Config._load_defaults(version)
         self.type_unwrap = get_type_unwrap_map(version, config)
         self.friendly_names = friendly_names  # schema_name -> Go type name
+        self._friendly_cache: Dict[str, str] = {}  # schema_name -> resolved Go type name
         self.generated_type_names: Set[str] = set()
+        self._nested_type_counters: Dict[str, int] = {}  # base name -> next dedup suffix
         self.enum_types: Dict[str, List[str]] = {}  # type_name -> enum values (per-file)
         self.current_type_name: str = ''  # Track current type being generated
         self.current_type_name_lower: str = ''  # Lowercase for enum override lookup
         self.output_format = output_format
+        self._field_emit = GO_FIELD_EMITTERS[output_format]
         # Known enum types that already exist (skip generating them)
-        self.known_enum_types = known_enum_types or set()
+        self.known_enum_types = frozenset(known_enum_types or ())
+
+    @classmethod
+    def reset_global_enums(cls) -> None:
+        """Forget all globally registered enum types."""
+        cls._global_enum_types.clear()
+        cls._global_enum_values_index.clear()
+
+    @classmethod
+    def _register_global_enum(cls, enum_type_name: str, values_key: Tuple[str, ...]) -> None:
+        """Register an enum type globally (by sorted values) and keep the values index in sync."""
+        replaced = enum_type_name in cls._global_enum_types
+        cls._global_enum_types[enum_type_name] = values_key
+        if replaced:
+            # Re-registration keeps the name's original position, so rebuild
+            # the index to keep "first registered name wins" exact
+            cls._global_enum_values_index.clear()
+            for name, values in cls._global_enum_types.items():
+                cls._global_enum_values_index.setdefault(values, name)
+            return
+        cls._global_enum_values_index.setdefault(values_key, enum_type_name)
 
     def get_friendly_name(self, schema_name: str) -> str:
         """Get friendly Go type name for a schema, using explicit mapping or auto-generation."""
+        cached = self._friendly_cache.get(schema_name)
+        if cached is not None:
+            return cached
         # Check if we have an explicit mapping
         if schema_name in self.friendly_names:
-            return self.friendly_names[schema_name]
-        # Use module-level function for auto-generation
-        return schema_to_friendly_name(schema_name, self.version_prefix, self.config)
+            name = self.friendly_names[schema_name]
+        else:
+            # Use module-level function for auto-generation
+            name = schema_to_friendly_name(schema_name, self.version_prefix, self.config)
+        self._friendly_cache[schema_name] = name
+        return name
 
     def is_timestamp_field(self, field_name: str) -> bool:
         """Check if a field represents a Unix timestamp (not a duration)."""
@@ -706,6 +846,12 @@ class TypeGenerator:
         Reuses existing type if same values already registered.
         Skips registration if type is in known_enum_types.
         """
+        # An enum without values carries no type information
+        if not enum_values:
+            return 'string'
+
+        values_key = tuple(sorted(enum_values))
+
         # Check for semantic enum override
         override_key = (self.current_type_name_lower, json_name)
         if override_key in self.config.enum_type_overrides:
@@ -714,15 +860,17 @@ class TypeGenerator:
             if semantic_name in self.known_enum_types:
                 return semantic_name
             # Check if already registered with same values
-            if semantic_name in TypeGenerator._global_enum_types:
-                existing_values = TypeGenerator._global_enum_types[semantic_name]
-                if set(existing_values) == set(enum_values):
-                    return semantic_name
+            if TypeGenerator._global_enum_types.get(semantic_name) == values_key:
+                return semantic_name
             # Register new semantic enum
-            TypeGenerator._global_enum_types[semantic_name] = enum_values
+            TypeGenerator._register_global_enum(semantic_name, values_key)
             self.enum_types[semantic_name] = enum_values
             return semantic_name
 
+        # Single-value enums (e.g. discriminators) are effectively constants
+        if len(enum_values) == 1 and self.config.collapse_singleton_enums:
+            return 'string'
+
         # Create a base type name from field name
         base_name = to_go_field_name(json_name)
         enum_type_name = base_name + ENUM_TYPE_SUFFIX
@@ -731,14 +879,12 @@ class TypeGenerator:
         if enum_type_name in self.known_enum_types:
             return enum_type_name
 
-        # Create a key for the enum values (frozen set for comparison)
-        values_key = tuple(sorted(enum_values))
-
-        # Check if this exact enum type already exists globally
-        for existing_name, existing_values in TypeGenerator._global_enum_types.items():
-            if tuple(sorted(existing_values)) == values_key:
-                # Reuse existing type
-                return existing_name
+        # Check if this exact enum type already exists globally (keyed by
+        # sorted values, so value order does not matter)
+        existing_name = TypeGenerator._global_enum_values_index.get(values_key)
+        if existing_name is not None:
+            # Reuse existing type
+            return existing_name
 
         # Check for name collision - make unique if needed
         if enum_type_name in TypeGenerator._global_enum_types:
@@ -746,7 +892,7 @@ class TypeGenerator:
             enum_type_name = self.current_type_name + base_name + ENUM_TYPE_SUFFIX
 
         # Register globally and locally
-        TypeGenerator._global_enum_types[enum_type_name] = enum_values
+        TypeGenerator._register_global_enum(enum_type_name, values_key)
         self.enum_types[enum_type_name] = enum_values
         return enum_type_name
 
@@ -816,31 +962,14 @@ class TypeGenerator:
         if 'enum' in prop:
             return self._get_enum_type_name(json_name, prop['enum'])
 
-        # Handle primitives
-        type_map = {
-            'string': 'string',
-            'integer': 'int32',
-            'number': 'float64',
-            'boolean': 'bool',
-        }
-
-        prop_type = prop.get('type', '')
-        go_type = type_map.get(prop_type, 'interface{}')
-
-        # Handle format overrides
+        # Handle primitives, with format overrides taking precedence
         fmt = prop.get('format', '')
-        if fmt == 'int64':
-            go_type = 'int64'
-        elif fmt == 'uint32':
-            go_type = 'uint32'
-        elif fmt == 'uint16':
-            go_type = 'uint16'
-        elif fmt == 'uint64':
-            go_type = 'time.Time' if self.is_timestamp_field(json_name) else 'uint64'
-        elif fmt == 'date-time':
-            go_type = 'time.Time'
-
-        return go_type
+        go_type = FORMAT_TYPE_MAP.get(fmt)
+        if go_type is not None:
+            return go_type
+        if fmt == 'uint64':
+            return 'time.Time' if self.is_timestamp_field(json_name) else 'uint64'
+        return PRIMITIVE_TYPE_MAP.get(prop.get('type', ''), 'interface{}')
 
     def generate_type(
         self,
@@ -854,8 +983,32 @@ class TypeGenerator:
 
         Returns: GeneratedType with all generation results
         """
-        file_name = type_name.lower() + '.gen.go'
+        additional_types: List[str] = []
+        code = self._generate_type_into(schema_name, schema, type_name, include_header,
+                                        additional_types)
+        return GeneratedType(
+            filename=type_name.lower() + '.gen.go',
+            code=code,
+            additional_types=additional_types,
+            field_count=len(schema.get('properties', {})),
+            type_name=type_name,
+            schema_name=schema_name
+        )
+
+    def _generate_type_into(
+        self,
+        schema_name: str,
+        schema: dict,
+        type_name: str,
+        include_header: bool,
+        additional_types: List[str]
+    ) -> str:
+        """
+        Generate the Go code for one type, appending nested and enum types
+        to additional_types (shared across the whole recursion).
 
+        Returns: the type's own Go code
+        """
         # Track current type for unique enum naming
         self.current_type_name = type_name
         self.current_type_name_lower = type_name.lower()
@@ -865,26 +1018,31 @@ class TypeGenerator:
 
         # Generate fields
         fields = []
-        additional_types = []
+        needs_time = False  # Any field type mentioning time.Time ([]time.Time too)
         props = schema.get('properties', {})
 
-        for json_name in sorted(props.keys()):
+        # Sorted for stable output; each (nested) property map is sorted once
+        for json_name in sorted(props):
             prop = props[json_name]
+            json_name = sys.intern(json_name)  # Shared across schemas; fast dict/set probes
+            field_name = to_go_field_name(json_name)
             field_type = None
 
             # Check for inline object that needs nested type
             if prop.get('type') == 'object' and prop.get('properties'):
-                field_name = to_go_field_name(json_name)
-
                 # Build unique nested type name
                 nested_type_name = f"{type_name}{field_name}"
 
-                # Deduplicate if needed
-                base_name = nested_type_name
-                counter = 2
-                while nested_type_name in self.generated_type_names:
+                # Deduplicate if needed, resuming after the last suffix used
+                # for this base (names are never released, so lower ones are taken)
+                if nested_type_name in self.generated_type_names:
+                    base_name = nested_type_name
+                    counter = self._nested_type_counters.get(base_name, 2)
                     nested_type_name = f"{base_name}{counter}"
-                    counter += 1
+                    while nested_type_name in self.generated_type_names:
+                        counter += 1
+                        nested_type_name = f"{base_name}{counter}"
+                    self._nested_type_counters[base_name] = counter + 1
 
                 self.generated_type_names.add(nested_type_name)
 
@@ -894,15 +1052,17 @@ class TypeGenerator:
                     'required': prop.get('required', [])
                 }
 
-                # Recursively generate nested type
-                nested_result = self.generate_type(
+                # Recursively generate nested type; its code goes before
+                # the types it nests, so reserve its slot first
+                slot = len(additional_types)
+                additional_types.append('')
+                additional_types[slot] = self._generate_type_into(
                     f"{schema_name}_{json_name}",
                     nested_schema,
                     nested_type_name,
-                    include_header=False
+                    False,
+                    additional_types
                 )
-                additional_types.append(nested_result.code)
-                additional_types.extend(nested_result.additional_types)
 
                 field_type = nested_type_name
 
@@ -915,82 +1075,76 @@ class TypeGenerator:
             description = truncate_description(description)
 
             field = GoField(
-                name=to_go_field_name(json_name),
+                name=field_name,
                 go_type=field_type,
                 json_tag=json_name,
                 description=description,
                 required=json_name in required_fields
             )
             fields.append(field)
+            if not needs_time and 'time.Time' in field_type:
+                needs_time = True
 
-        # Generate Go code
+        # Generate Go code as a list of parts joined once at the end
+        parts = []
         if include_header:
-            needs_time = any('time.Time' in f.go_type for f in fields)
-            time_import = 'import "time"\n\n' if needs_time else ''
-
-            if self.output_format == OutputFormat.MINIMAL:
-                type_comment = ""
-            else:
-                type_comment = f"// {type_name} represents a SLURM {type_name}.\n"
-
-            code = f'''// Code generated from OpenAPI spec. DO NOT EDIT.
-// SPDX-FileCopyrightText: {datetime.now().year} Jon Thor Kristinsson
-// SPDX-License-Identifier: Apache-2.0
-
-package api
-
-{time_import}{type_comment}type {type_name} struct {{
-{chr(10).join(f.to_string(self.output_format) for f in fields)}
-}}
-'''
-        else:
-            if self.output_format == OutputFormat.MINIMAL:
-                nested_comment = ""
-            else:
-                nested_comment = f"// {type_name} is a nested type within its parent.\n"
-
-            code = f'''{nested_comment}type {type_name} struct {{
-{chr(10).join(f.to_string(self.output_format) for f in fields)}
-}}
-'''
+            parts.append(
+                '// Code generated from OpenAPI spec. DO NOT EDIT.\n'
+                f'// SPDX-FileCopyrightText: {datetime.now().year} Jon Thor Kristinsson\n'
+                '// SPDX-License-Identifier: Apache-2.0\n'
+                '\n'
+                'package api\n'
+                '\n'
+            )
+            if needs_time:
+                parts.append('import "time"\n\n')
+            if self.output_format != OutputFormat.MINIMAL:
+                parts.append(f"// {type_name} represents a SLURM {type_name}.\n")
+        elif self.output_format != OutputFormat.MINIMAL:
+            parts.append(f"// {type_name} is a nested type within its parent.\n")
+
+        parts.append(f'type {type_name} struct {{\n')
+        field_emit = self._field_emit
+        for f in fields:
+            parts.append(field_emit(f))
+            parts.append('\n')
+        if not fields:
+            parts.append('\n')  # Keep the blank body line of empty structs
+        parts.append('}\n')
+        code = ''.join(parts)
 
         # Generate enum types collected during field resolution
         enum_code = self._generate_enum_types()
         if enum_code:
             additional_types.append(enum_code)
 
-        return GeneratedType(
-            filename=file_name,
-            code=code,
-            additional_types=additional_types,
-            field_count=len(props),
-            type_name=type_name,
-            schema_name=schema_name
-        )
+        return code
 
     def _generate_enum_types(self) -> str:
         """Generate Go type aliases and constants for collected enum types."""
         if not self.enum_types:
             return ''
 
+        emit_comments = self.output_format != OutputFormat.MINIMAL
         lines = []
         for enum_name, values in sorted(self.enum_types.items()):
+            # Enum name without the 'Value' suffix, shared by all its constants
+            prefix = enum_name.replace(ENUM_TYPE_SUFFIX, '')
+
             # Generate type alias
-            if self.output_format != OutputFormat.MINIMAL:
-                field_hint = enum_name.replace(ENUM_TYPE_SUFFIX, '')
-                lines.append(f'// {enum_name} represents possible values for {field_hint} field.')
+            if emit_comments:
+                lines.append(f'// {enum_name} represents possible values for {prefix} field.')
             lines.append(f'type {enum_name} string')
             lines.append('')
 
             # Generate constants
-            if self.output_format != OutputFormat.MINIMAL:
+            if emit_comments:
                 lines.append(f'// {enum_name} constants.')
-            lines.append('const (')
-            for value in values:
-                # Convert enum value to Go constant name
-                const_name = self._enum_value_to_const(enum_name, value)
-                lines.append(f'\t{const_name} {enum_name} = "{value}"')
-            lines.append(')')
+            # One string per const block; each value becomes a Go constant name
+            to_const = self._enum_value_to_const
+            lines.append('const (\n' + ''.join(
+                f'\t{to_const(prefix, value)} {enum_name} = "{value}"\n' for value in values
+            ) + ')')
             lines.append('')
 
         # Clear enum types after generation (for next file)
@@ -998,23 +1152,27 @@ package api
 
         return '\n'.join(lines)
 
-    def _enum_value_to_const(self, enum_name: str, value: str) -> str:
-        """Convert an enum value to a Go constant name."""
-        # Remove 'Value' suffix from enum_name for the prefix
-        prefix = enum_name.replace(ENUM_TYPE_SUFFIX, '')
+    def _enum_value_to_const(self, prefix: str, value: str) -> str:
+        """Convert an enum value to a Go constant name, prefixed by its enum name sans suffix."""
         # Replace special characters with underscores, then convert to PascalCase
-        clean_value = re.sub(r'[^a-zA-Z0-9_]', '_', value)
+        if not value.isascii():
+            clean_value = ENUM_VALUE_INVALID_CHARS.sub('_', value)
+        elif value.isidentifier():
+            clean_value = value  # Nothing to replace
+        else:
+            clean_value = value.translate(ENUM_VALUE_TRANSLATION)
         parts = clean_value.split('_')
         # Filter out empty parts and use GO_ACRONYMS for proper casing
         result_parts = []
         for p in parts:
             if not p:
                 continue
-            lower = p.lower()
-            if lower in GO_ACRONYMS:
-                result_parts.append(GO_ACRONYMS[lower])
-            else:
-                result_parts.append(p.capitalize())
+            if len(p) <= GO_ACRONYM_MAX_LEN:
+                acronym = GO_ACRONYMS.get(p.lower())
+                if acronym is not None:
+                    result_parts.append(acronym)
+                    continue
+            result_parts.append(p.capitalize())
         pascal_value = ''.join(result_parts)
         return f'{prefix}{pascal_value}'
 
@@ -1025,7 +1183,7 @@ package api
 
 def main():
     # Reset global state
-    TypeGenerator._global_enum_types.clear()
+    TypeGenerator.reset_global_enums()
 
     # Determine default config path (relative to script)
     script_dir = Path(__file__).resolve().parent
@@ -1125,41 +1283,40 @@ Examples:
 
     # Create generator (with any extra unwrap mappings from discovery)
     # When generating write types, provide known enum types to avoid regenerating them
-    known_enums: Set[str] = set()
+    known_enums: FrozenSet[str] = frozenset()
     if args.write_types:
         # These enums are already defined in the read types (job.gen.go, etc.)
         # We only want to generate NEW enums that are specific to write types
-        known_enums = {
+        known_enums = frozenset({
             'FlagsValue', 'MailTypeValue', 'ProfileValue', 'SharedValue',  # From Job
             'JobState', 'NodeState', 'PartitionState',  # Semantic enums
             # Add more as needed from other generated types
-        }
+        })
     generator = TypeGenerator(spec, version, entity_schemas, config, output_format, known_enums)
     if args.discover:
         generator.type_unwrap.update(extra_unwrap)
 
     generated_files = []
     for schema_name, friendly_name in entity_schemas.items():
-        if schema_name not in schemas:
+        schema = schemas.get(schema_name)
+        if schema is None:
             print(f"  Warning: Schema {schema_name} not found in spec")
             continue
 
-        schema = schemas[schema_name]
         result = generator.generate_type(schema_name, schema, friendly_name)
 
-        # Combine main type and nested types
-        if result.additional_types:
-            full_code = '\n\n'.join([result.code] + result.additional_types)
-        else:
-            full_code = result.code
-
         output_file = args.output_dir / result.filename
 
         if args.dry_run:
             print(f"Would generate: {output_file} ({result.field_count} fields)")
         else:
-            with open(output_file, 'w') as f:
-                f.write(full_code)
+            # Write main type and nested types as separate chunks rather
+            # than joining them into one file-sized string first
+            with open(output_file, 'w', buffering=1 << 16) as f:
+                f.write(result.code)
+                for extra in result.additional_types:
+                    f.write('\n\n')
+                    f.write(extra)
 
             print(f"  Generated {friendly_name} ({result.field_count} fields) -> {result.filename}")
             generated_files.append(output_file)
@@ -4,10 +4,15 @@ Unit tests for generate_clean_types.py
 
 Run with: python3 -m pytest test_generate_clean_types.py -v
 Or:       python3 test_generate_clean_types.py
+Parallel: python3 -m pytest test_generate_clean_types.py -n auto  (pytest-xdist)
 """
 
+import json
+import tempfile
 import unittest
 from pathlib import Path
+from types import MappingProxyType
+from unittest import mock
 
 # Import the module under test
 from generate_clean_types import (
@@ -21,12 +26,33 @@ from generate_clean_types import (
     TypeGenerator,
     OutputFormat,
     discover_schemas,
+    get_base_entities,
+    get_entity_schemas,
+    get_write_entity_schemas,
     validate_openapi_spec,
+    load_openapi_spec,
     OpenAPIValidationError,
+    IJSON_AVAILABLE,
     GO_ACRONYMS,
     DEFAULT_ENUM_TYPE_OVERRIDES,
 )
 
+# Read-only spec shared by the TypeGenerator tests (no test mutates it)
+SIMPLE_TYPE_SPEC = MappingProxyType({
+    'components': {
+        'schemas': {
+            'v0.0.44_simple_type': {
+                'type': 'object',
+                'properties': {
+                    'name': {'type': 'string', 'description': 'The name'},
+                    'count': {'type': 'integer', 'description': 'Count'},
+                },
+                'required': ['name']
+            }
+        }
+    }
+})
+
 
 class TestToGoFieldName(unittest.TestCase):
     """Tests for to_go_field_name function."""
@@ -132,6 +158,14 @@ class TestFindAllRefs(unittest.TestCase):
         refs = find_all_refs(obj)
         self.assertEqual(refs, set())
 
+    def test_deeply_nested_refs(self):
+        """Deep nesting does not hit the recursion limit."""
+        obj = {'$ref': '#/components/schemas/v0.0.44_leaf'}
+        for _ in range(5000):
+            obj = {'items': [obj]}
+        refs = find_all_refs(obj)
+        self.assertEqual(refs, {'v0.0.44_leaf'})
+
 
 class TestTruncateDescription(unittest.TestCase):
     """Tests for truncate_description function."""
@@ -251,9 +285,14 @@ class TestGeneratedType(unittest.TestCase):
 class TestConfig(unittest.TestCase):
     """Tests for Config class."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Load the default config once (tests that mutate it load their own)."""
+        cls.default_config = Config._load_defaults('0.0.44')
+
     def test_load_defaults(self):
         """Load default config without YAML file."""
-        config = Config._load_defaults('0.0.44')
+        config = self.default_config
         self.assertIn('boot_time', config.timestamp_fields)
         self.assertIn('time', config.duration_fields)
         self.assertIn('assoc', config.friendly_overrides)
@@ -261,7 +300,7 @@ class TestConfig(unittest.TestCase):
 
     def test_is_timestamp_vs_duration(self):
         """Verify timestamp/duration field classification."""
-        config = Config._load_defaults('0.0.44')
+        config = self.default_config
         # boot_time is a timestamp
         self.assertIn('boot_time', config.timestamp_fields)
         self.assertNotIn('boot_time', config.duration_fields)
@@ -270,42 +309,48 @@ class TestConfig(unittest.TestCase):
 
     def test_enum_type_overrides(self):
         """Config includes enum type overrides."""
-        config = Config._load_defaults('0.0.44')
+        config = self.default_config
         self.assertIn(('node', 'state'), config.enum_type_overrides)
         self.assertEqual(config.enum_type_overrides[('node', 'state')], 'NodeState')
 
     def test_step_id_friendly_override(self):
         """StepID uses proper ID casing in friendly overrides."""
-        config = Config._load_defaults('0.0.44')
+        config = self.default_config
         self.assertEqual(config.friendly_overrides.get('slurm_step_id'), 'StepID')
 
+    def test_entity_schemas_follow_config(self):
+        """Entity helpers key by versioned schema name and reflect config edits."""
+        config = Config._load_defaults('0.0.44')
+        self.assertEqual(get_base_entities('0.0.44', config)['v0.0.44_job_info'], 'Job')
+        self.assertIn('v0.0.43_node', get_entity_schemas('0.0.43', config))
+        config.auxiliary_types['extra_thing'] = 'ExtraThing'
+        self.assertEqual(get_entity_schemas('0.0.44', config)['v0.0.44_extra_thing'], 'ExtraThing')
+        self.assertEqual(get_write_entity_schemas('0.0.44', config),
+                         {'v0.0.44_job_desc_msg': 'JobCreate'})
+        config.write_auxiliary_types['cron_entry'] = 'CronEntry'
+        self.assertEqual(get_write_entity_schemas('0.0.44', config)['v0.0.44_cron_entry'], 'CronEntry')
+
 
 class TestTypeGenerator(unittest.TestCase):
     """Tests for TypeGenerator class."""
 
+    spec = SIMPLE_TYPE_SPEC
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up read-only fixtures shared by all tests."""
+        cls.default_config = Config._load_defaults('0.0.44')
+
     def setUp(self):
         """Set up test fixtures."""
         # Reset global enum state
-        TypeGenerator._global_enum_types.clear()
+        TypeGenerator.reset_global_enums()
 
-        self.spec = {
-            'components': {
-                'schemas': {
-                    'v0.0.44_simple_type': {
-                        'type': 'object',
-                        'properties': {
-                            'name': {'type': 'string', 'description': 'The name'},
-                            'count': {'type': 'integer', 'description': 'Count'},
-                        },
-                        'required': ['name']
-                    }
-                }
-            }
-        }
         self.generator = TypeGenerator(
             self.spec,
             '0.0.44',
-            {'v0.0.44_simple_type': 'SimpleType'}
+            {'v0.0.44_simple_type': 'SimpleType'},
+            self.default_config
         )
 
     def test_is_timestamp_field(self):
@@ -323,6 +368,15 @@ class TestTypeGenerator(unittest.TestCase):
         self.assertEqual(self.generator.resolve_type({'type': 'boolean'}, 'flag'), 'bool')
         self.assertEqual(self.generator.resolve_type({'type': 'number'}, 'amount'), 'float64')
 
+    def test_resolve_type_formats(self):
+        """Format overrides take precedence over the primitive type."""
+        self.assertEqual(self.generator.resolve_type({'type': 'integer', 'format': 'int64'}, 'count'), 'int64')
+        self.assertEqual(self.generator.resolve_type({'type': 'integer', 'format': 'uint16'}, 'count'), 'uint16')
+        self.assertEqual(self.generator.resolve_type({'type': 'string', 'format': 'date-time'}, 'when'), 'time.Time')
+        self.assertEqual(self.generator.resolve_type({'type': 'integer', 'format': 'uint64'}, 'count'), 'uint64')
+        self.assertEqual(self.generator.resolve_type({'type': 'integer', 'format': 'uint64'}, 'end_time'), 'time.Time')
+        self.assertEqual(self.generator.resolve_type({'type': 'integer', 'format': 'int32'}, 'count'), 'int32')
+
     def test_resolve_type_arrays(self):
         """Resolve array types correctly."""
         self.assertEqual(
@@ -345,12 +399,63 @@ class TestTypeGenerator(unittest.TestCase):
         self.assertEqual(result.field_count, 2)
         self.assertEqual(result.type_name, 'SimpleType')
 
+    def test_time_import(self):
+        """The time import is only emitted when a field uses time.Time."""
+        schema = {'properties': {'boot_time': {'type': 'integer', 'format': 'uint64'}}}
+        result = self.generator.generate_type('v0.0.44_timed', schema, 'Timed')
+        self.assertIn('import "time"', result.code)
+        result = self.generator.generate_type(
+            'v0.0.44_simple_type',
+            self.spec['components']['schemas']['v0.0.44_simple_type'],
+            'SimpleType'
+        )
+        self.assertNotIn('import "time"', result.code)
+
+    def test_nested_type_name_dedup(self):
+        """Repeated nested type names get increasing numeric suffixes."""
+        schema = {'properties': {'limits': {'type': 'object', 'properties': {'max': {'type': 'integer'}}}}}
+        names = []
+        for _ in range(3):
+            result = self.generator.generate_type('v0.0.44_parent', schema, 'Parent', include_header=False)
+            names.append(result.additional_types[0].split(' struct')[0].rsplit(' ', 1)[-1])
+        self.assertEqual(names, ['ParentLimits', 'ParentLimits2', 'ParentLimits3'])
+
+    def test_enum_reuse_same_values(self):
+        """Enums with the same values (in any order) share one type."""
+        first = self.generator.resolve_type({'enum': ['A', 'B']}, 'mode')
+        second = self.generator.resolve_type({'enum': ['B', 'A']}, 'other_mode')
+        self.assertEqual(first, 'ModeValue')
+        self.assertEqual(second, 'ModeValue')
+
+    def test_enum_name_collision(self):
+        """Same field name with different values is prefixed by the parent type."""
+        self.generator.current_type_name = 'SimpleType'
+        self.assertEqual(self.generator.resolve_type({'enum': ['A', 'B']}, 'mode'), 'ModeValue')
+        self.assertEqual(self.generator.resolve_type({'enum': ['C', 'D']}, 'mode'), 'SimpleTypeModeValue')
+
+    def test_degenerate_enums(self):
+        """Empty enums are strings; single-value enums only collapse when configured."""
+        self.assertEqual(self.generator.resolve_type({'enum': []}, 'mode'), 'string')
+        self.assertEqual(self.generator.resolve_type({'enum': ['only']}, 'kind'), 'KindValue')
+        config = Config._load_defaults('0.0.44')
+        config.collapse_singleton_enums = True
+        generator = TypeGenerator(self.spec, '0.0.44', {}, config)
+        self.assertEqual(generator.resolve_type({'enum': ['only']}, 'other_kind'), 'string')
+
+    def test_enum_value_to_const(self):
+        """Enum values are sanitized and converted to PascalCase constants."""
+        self.assertEqual(self.generator._enum_value_to_const('State', 'RUNNING'), 'StateRunning')
+        self.assertEqual(self.generator._enum_value_to_const('State', 'node-fail'), 'StateNodeFail')
+        self.assertEqual(self.generator._enum_value_to_const('Flags', 'gres.cpu'), 'FlagsGRESCPU')
+        self.assertEqual(self.generator._enum_value_to_const('Mode', 'caf\u00e9 mode'), 'ModeCafMode')
+
     def test_output_format_minimal(self):
         """Minimal output format removes comments."""
         generator = TypeGenerator(
             self.spec,
             '0.0.44',
             {'v0.0.44_simple_type': 'SimpleType'},
+            self.default_config,
             output_format=OutputFormat.MINIMAL
         )
         result = generator.generate_type(
@@ -369,7 +474,7 @@ class TestEnumTypeOverrides(unittest.TestCase):
 
     def setUp(self):
         """Reset global enum state."""
-        TypeGenerator._global_enum_types.clear()
+        TypeGenerator.reset_global_enums()
 
     def test_default_enum_overrides_exist(self):
         """Default enum overrides are defined."""
@@ -501,5 +606,66 @@ class TestValidateOpenAPISpec(unittest.TestCase):
         self.assertTrue(any('info' in w for w in warnings))
 
 
+class TestLoadOpenAPISpec(unittest.TestCase):
+    """Tests for load_openapi_spec function."""
+
+    # Spec with a float default, to check the loaders keep it a float
+    SECTIONS_SPEC = {
+        'paths': {'/slurm/v0.0.44/jobs': {'get': {}}},
+        'components': {
+            'schemas': {
+                'v0.0.44_test': {'type': 'object', 'properties': {'n': {'type': 'number', 'default': 1.5}}}
+            }
+        },
+        'info': {'version': 'Slurm-25.11.1'},
+    }
+
+    def _write_spec(self, content: str) -> Path:
+        tmp = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+        with tmp:
+            tmp.write(content)
+        self.addCleanup(Path(tmp.name).unlink)
+        return Path(tmp.name)
+
+    def test_loads_sections(self):
+        """Info and components are loaded intact."""
+        spec = self.SECTIONS_SPEC
+        loaded = load_openapi_spec(self._write_spec(json.dumps(spec)))
+        self.assertEqual(loaded['components'], spec['components'])
+        self.assertEqual(loaded['info'], spec['info'])
+
+    @unittest.skipUnless(IJSON_AVAILABLE, 'ijson not installed')
+    @mock.patch('generate_clean_types.STREAMING_SPEC_MIN_BYTES', 0)
+    def test_streaming_loads_sections(self):
+        """Streaming load rebuilds info and components intact (floats stay floats)."""
+        spec = self.SECTIONS_SPEC
+        loaded = load_openapi_spec(self._write_spec(json.dumps(spec)))
+        self.assertEqual(loaded['components'], spec['components'])
+        self.assertEqual(loaded['info'], spec['info'])
+        default = loaded['components']['schemas']['v0.0.44_test']['properties']['n']['default']
+        self.assertIs(type(default), float)
+
+    def test_small_spec_parsed_whole(self):
+        """Specs below the streaming threshold are parsed in full."""
+        spec = {'paths': {'/x': {}}, 'components': {'schemas': {}}}
+        loaded = load_openapi_spec(self._write_spec(json.dumps(spec)))
+        self.assertEqual(loaded, spec)
+
+    @unittest.skipUnless(IJSON_AVAILABLE, 'ijson not installed')
+    @mock.patch('generate_clean_types.STREAMING_SPEC_MIN_BYTES', 0)
+    def test_streaming_skips_paths(self):
+        """Streaming load does not materialize the paths section."""
+        spec = {'paths': {'/x': {}}, 'components': {'schemas': {}}}
+        loaded = load_openapi_spec(self._write_spec(json.dumps(spec)))
+        self.assertNotIn('paths', loaded)
+
+    @unittest.skipUnless(IJSON_AVAILABLE, 'ijson not installed')
+    @mock.patch('generate_clean_types.STREAMING_SPEC_MIN_BYTES', 0)
+    def test_streaming_invalid_json(self):
+        """Malformed JSON raises OpenAPIValidationError."""
+        with self.assertRaises(OpenAPIValidationError):
+            load_openapi_spec(self._write_spec('{"components": {'))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -14,42 +14,87 @@ import argparse
 import json
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Set, List, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterable, KeysView, Mapping, Set, List, Tuple
+
+# Optional ijson import for streaming very large specs
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Try to import orjson for the full parse, fall back to json if not available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Go struct tag JSON field name (up to the first comma, e.g. omitempty)
+# (bytes pattern: files are scanned undecoded, only matches are decoded)
+JSON_TAG_PATTERN = re.compile(rb'`json:"([^",]+)')
+
+# Versioned schema name prefix, e.g. 'v0.0.44_job_info' -> '0.0.44'
+SCHEMA_VERSION_PATTERN = re.compile(r'v(\d+\.\d+\.\d+)_')
+
+# Specs at least this large are streamed (with ijson) rather than parsed whole
+STREAMING_SPEC_MIN_BYTES = 32 * 1024 * 1024
 
 
 def load_openapi_spec(spec_file: Path) -> dict:
-    """Load OpenAPI specification from JSON file."""
+    """Load OpenAPI specification from JSON file (with orjson if available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(spec_file.read_bytes())
     with open(spec_file) as f:
         return json.load(f)
 
 
 def extract_json_tags(go_file: Path) -> Set[str]:
     """Extract JSON field names from Go struct."""
-    content = go_file.read_text()
-    pattern = r'`json:"([^",]+)'
-    return set(re.findall(pattern, content))
+    return {tag.decode() for tag in JSON_TAG_PATTERN.findall(go_file.read_bytes())}
 
 
-def get_schema_fields(schema: dict) -> Set[str]:
-    """Extract field names from OpenAPI schema."""
-    return set(schema.get('properties', {}).keys())
+def get_schema_fields(schema: dict) -> KeysView[str]:
+    """Extract field names from OpenAPI schema (a view, no copy)."""
+    return schema.get('properties', {}).keys()
 
 
-def detect_version(spec: dict) -> str:
-    """Detect API version from schema names."""
-    schemas = spec.get('components', {}).get('schemas', {})
-    for name in schemas.keys():
-        match = re.match(r'v(\d+\.\d+\.\d+)_', name)
+def load_schema_fields(spec_file: Path) -> Dict[str, KeysView[str]]:
+    """
+    Load schema name -> field names from the spec's components.schemas.
+
+    Large specs are streamed with ijson (if installed) so that paths and
+    schema bodies are never held in memory all at once.
+    """
+    if IJSON_AVAILABLE and spec_file.stat().st_size >= STREAMING_SPEC_MIN_BYTES:
+        with open(spec_file, 'rb') as f:
+            # Keep only the property names, not the property bodies
+            return {
+                name: dict.fromkeys(get_schema_fields(schema)).keys()
+                for name, schema in ijson.kvitems(f, 'components.schemas', use_float=True)
+            }
+    schemas = load_openapi_spec(spec_file).get('components', {}).get('schemas', {})
+    return {name: get_schema_fields(schema) for name, schema in schemas.items()}
+
+
+def detect_version_from_names(schema_names: Iterable[str]) -> str:
+    """Detect API version from the first versioned schema name."""
+    match_version = SCHEMA_VERSION_PATTERN.match
+    for name in schema_names:
+        match = match_version(name)
         if match:
             return match.group(1)
     return '0.0.44'
 
 
-def get_type_mappings(version: str) -> dict:
-    """Get mapping from Go file -> OpenAPI schema name."""
+@lru_cache(maxsize=4)
+def get_type_mappings(version: str) -> Mapping[str, str]:
+    """Get mapping from Go file -> OpenAPI schema name (cached, so read-only)."""
     prefix = f'v{version}_'
-    return {
+    return MappingProxyType({
         'job.gen.go': f'{prefix}job_info',
         'node.gen.go': f'{prefix}node',
         'account.gen.go': f'{prefix}account',
@@ -73,7 +118,7 @@ def get_type_mappings(version: str) -> dict:
         'jobresnode.gen.go': f'{prefix}job_res_node',
         'jobressocket.gen.go': f'{prefix}job_res_socket',
         'jobrescore.gen.go': f'{prefix}job_res_core',
-    }
+    })
 
 
 def verify_coverage(
@@ -87,10 +132,15 @@ def verify_coverage(
     Returns:
         (total_fields, covered_fields, issues)
     """
-    spec = load_openapi_spec(spec_file)
-    schemas = spec.get('components', {}).get('schemas', {})
-    version = detect_version(spec)
+    all_schema_fields = load_schema_fields(spec_file)
+    version = detect_version_from_names(all_schema_fields)
     mappings = get_type_mappings(version)
+    # Field sets for just the mapped schemas (the spec has many more)
+    schema_fields = {
+        name: frozenset(all_schema_fields[name])
+        for name in set(mappings.values())
+        if name in all_schema_fields
+    }
 
     total_spec_fields = 0
     total_matched = 0
@@ -104,23 +154,26 @@ def verify_coverage(
                 print(f"  {go_file}: NOT FOUND")
             continue
 
-        if schema_name not in schemas:
+        if schema_name not in schema_fields:
             if verbose:
                 print(f"  {go_file}: Schema {schema_name} not in spec")
             continue
 
         go_tags = extract_json_tags(go_path)
-        spec_fields = get_schema_fields(schemas[schema_name])
+        spec_fields = schema_fields[schema_name]
 
-        matched = go_tags & spec_fields
-        missing = spec_fields - go_tags
+        # Only build the missing set when something is missing (the usual
+        # fully covered case needs just the subset check); matched fields
+        # are counted, never materialized
+        missing = frozenset() if spec_fields <= go_tags else spec_fields - go_tags
+        matched = len(spec_fields) - len(missing)
 
         total_spec_fields += len(spec_fields)
-        total_matched += len(matched)
+        total_matched += matched
 
-        pct = (len(matched) / len(spec_fields) * 100) if spec_fields else 100
+        pct = (matched / len(spec_fields) * 100) if spec_fields else 100
 
-        results.append((go_file, schema_name, len(matched), len(spec_fields), pct, missing))
+        results.append((go_file, schema_name, matched, len(spec_fields), pct, missing))
 
         if missing:
             issues.append(f"{go_file}: missing {sorted(missing)}")